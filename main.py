@@ -1,18 +1,24 @@
 from fastapi import FastAPI, UploadFile, File
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse
 import uvicorn
+import asyncio
+import os
 import pandas as pd
 from pathlib import Path
-import random
-from ortools.sat.python import cp_model
+from urllib.parse import urlencode
+import hashlib
+import jinja2
 import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import json
 
-app = FastAPI()
+# orjson serializes the 350-row filter/calendar payloads in C instead of
+# the stdlib json encoder, and handles numpy scalars and NaN natively
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# The CSS-heavy /visualize page and the 350-row JSON payloads compress
+# well; anything above 1KB goes out gzipped
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 # Mount static files directory
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -33,23 +39,22 @@ async def upload_file(file: UploadFile = File(...)):
         Path("uploads").mkdir(exist_ok=True)
         Path("processed").mkdir(exist_ok=True)
         
-        # Save uploaded file
-        content = await file.read()
+        # Stream the upload to disk in 1MB chunks instead of buffering the
+        # whole file in memory first
         upload_path = Path("uploads") / file.filename
         with open(upload_path, "wb") as f:
-            f.write(content)
-        
-        # Process the CSV and solve the seating plan
+            while chunk := await file.read(1 << 20):
+                f.write(chunk)
+
+        # Process the CSV and solve the seating plan; the parsed frame is
+        # passed straight through instead of round-tripping via CSV files
         df = pd.read_csv(upload_path)
-        df.to_csv("employees_350.csv", index=False)
-        
-        # Call solve endpoint
-        await solve_seating()
-        
-        # Copy the solved seating plan to processed directory
-        if Path("seating_plan.csv").exists():
+        # CP-SAT is blocking; run it off the event loop so other requests
+        # keep being served while the solver works
+        seating_df = await asyncio.to_thread(_solve, df)
+
+        if seating_df is not None:
             processed_path = Path("processed") / file.filename
-            seating_df = pd.read_csv("seating_plan.csv")
             seating_df.to_csv(processed_path, index=False)
             print(f"Saved processed file to: {processed_path}")
             
@@ -87,148 +92,283 @@ FLOORS = {1: 50, 2: 48}  # Floor: Seats
 MAX_DEPT_PERCENT = 0.6
 SEATS_PER_TABLE = 6
 
+# Seat and table geometry is fixed by SEATS_PER_TABLE, so the trig is
+# computed once here instead of per seat per table in the diagram builders
+_SEAT_ANGLES = 2 * np.pi * np.arange(SEATS_PER_TABLE) / SEATS_PER_TABLE
+_SEAT_COS = np.cos(_SEAT_ANGLES)
+_SEAT_SIN = np.sin(_SEAT_ANGLES)
+# Closed hexagon outline used to draw a table
+_TABLE_COS = np.cos(2 * np.pi * np.arange(7) / 6)
+_TABLE_SIN = np.sin(2 * np.pi * np.arange(7) / 6)
+# Percentage offsets of the six seats around a table in the HTML diagram
+_SEAT_LEFT = (50 + 40 * _SEAT_COS).tolist()
+_SEAT_TOP = (50 + 40 * _SEAT_SIN).tolist()
+
+# Solved plans keyed by roster content hash, so repeat solves of the same
+# employee list skip the model build and the 30s solver budget entirely
+_solve_cache = {}
+
+# Parsed seating plan cached against the CSV's mtime so the read endpoints
+# skip the re-parse until the solver rewrites the file
+_plan_cache = None
+
+
+def _load_plan():
+    global _plan_cache
+    path = Path("seating_plan.csv")
+    if not path.exists():
+        return None
+    mtime = path.stat().st_mtime
+    if _plan_cache is not None and _plan_cache[0] == mtime:
+        return _plan_cache[1]
+    df = pd.read_csv(path)
+    df['Department'] = df['Department'].astype('category')
+    _plan_cache = (mtime, df)
+    return df
+
 # Solver
 @app.post("/solve")
 async def solve_seating():
-    # Load data
+    # Standalone entry point: load the last-known roster from disk. Uploads
+    # call _solve directly with the frame they already hold.
     df = pd.read_csv("employees_350.csv")
+    await asyncio.to_thread(_solve, df)
+
+
+def _solve(df):
+    # OR-Tools is only needed when a solve actually runs; importing it here
+    # keeps it off the server's cold-start path
+    from ortools.sat.python import cp_model
+
+    # Re-serve the cached plan when the roster is unchanged
+    roster_key = hashlib.md5(df.to_csv(index=False).encode()).hexdigest()
+    cached = _solve_cache.get(roster_key)
+    if cached is not None:
+        cached.to_csv("seating_plan.csv", index=False)
+        _load_plan()
+        print("Seating plan served from cache")
+        return cached
 
-    # Shuffle employee order to avoid bias
-    employees = list(df['ID'])
-    random.seed(42)
-    random.shuffle(employees)
+    # Department repeats heavily across 350 rows; categorical codes make the
+    # groupby and equality filters integer comparisons instead of string ones
+    df['Department'] = df['Department'].astype('category')
 
     # Group employees by department
-    departments = df.groupby('Department')['ID'].apply(list).to_dict()
+    # agg(list) uses the cythonized grouped path; apply(list) falls back to
+    # a Python call per group
+    departments = df.groupby('Department', observed=True)['ID'].agg(list).to_dict()
 
+    # Deterministic order: largest departments first, then by ID. The old
+    # random shuffle only changed Python-side emission order, which CP-SAT
+    # renumbers in presolve anyway.
+    dept_sizes = {d: len(m) for d, m in departments.items()}
+    dept_of = dict(zip(df['ID'], df['Department']))
+    employees = sorted(df['ID'], key=lambda e: (-dept_sizes[dept_of[e]], dept_of[e], e))
 
-    # Model
-    model = cp_model.CpModel()
+    # Hoist the floor ordering once; the constraint loops below iterate it
+    # many times per employee
+    floor_list = list(FLOORS)
+    floor_caps = list(FLOORS.items())
 
-    # Variables
-    emp_floor = {
-        (e, f): model.NewBoolVar(f'emp_{e}_floor_{f}')
-        for e in employees
-        for f in FLOORS
-    }
 
-    emp_offsite = {
-        e: model.NewBoolVar(f'emp_{e}_offsite')
-        for e in employees
-    }
+    # Model
+    model = cp_model.CpModel()
 
-    # Seat integer + boolean assignment variables
-    emp_seat = {
-        (e, f): model.NewIntVar(0, FLOORS[f], f'emp_{e}_seat_{f}')
-        for e in employees
-        for f in FLOORS
-    }
+    # Variables, laid out as index-addressed arrays (structure-of-arrays)
+    # instead of tuple-keyed dicts so constraint emission does integer
+    # indexing rather than tuple hashing
+    num_emps = len(employees)
+    emp_index = {e: i for i, e in enumerate(employees)}
 
-    emp_seat_bool = {}
-    for e in employees:
-        for f, cap in FLOORS.items():
-            for seat in range(1, cap + 1):
-                emp_seat_bool[(e, f, seat)] = model.NewBoolVar(f'emp_{e}_floor_{f}_seat_{seat}')
+    # Variables are unnamed: the f-string names were only ever seen by the
+    # solver's debug output and cost a string build per variable
+    emp_floor = np.empty((num_emps, len(floor_list)), dtype=object)
+    for i in range(num_emps):
+        for j in range(len(floor_list)):
+            emp_floor[i, j] = model.NewBoolVar('')
 
-    # Each employee assigned exactly one place (a floor or offsite)
-    for e in employees:
-        model.Add(sum(emp_floor[(e, f)] for f in FLOORS) + emp_offsite[e] == 1)
+    # One choice variable per employee: on-site iff assigned to some floor.
+    # The old emp_offsite Boolean was just its negation, linked through an
+    # extra equality; offsite is now expressed as on_site[i].Not().
+    on_site = np.array(
+        [model.NewBoolVar('') for _ in range(num_emps)], dtype=object
+    )
 
-    # Link emp_seat integer with seat bool vars per employee-floor
-    for e in employees:
-        for f, cap in FLOORS.items():
-            model.Add(emp_seat[(e, f)] == sum(seat * emp_seat_bool[(e, f, seat)] for seat in range(1, cap + 1)))
-            model.Add(sum(emp_seat_bool[(e, f, seat)] for seat in range(1, cap + 1)) == emp_floor[(e, f)])
+    # An employee occupies exactly one floor when on-site, none otherwise
+    for i in range(num_emps):
+        model.Add(sum(emp_floor[i]) == on_site[i])
 
     # Floor seat capacity constraints
-    for f, cap in FLOORS.items():
-        model.Add(sum(emp_floor[(e, f)] for e in employees) <= cap)
-
-    # No two employees share the same seat on the same floor
-    for f, cap in FLOORS.items():
-        for seat in range(1, cap + 1):
-            model.AddAtMostOne(emp_seat_bool[(e, f, seat)] for e in employees)
-
-    # Max 60% of each department on-site (physical floors only)
-    for dept, members in departments.items():
-        max_on_site = int(MAX_DEPT_PERCENT * len(members))
-        model.Add(
-            sum(emp_floor[(e, f)] for e in members for f in FLOORS) <= max_on_site
-        )
-
-    # Teams sit on the same floor
-    for dept, members in departments.items():
-        for f in FLOORS:
-            for e in members:
-                for m in members:
-                    if m != e:
-                        # If both e and m are on-site, they must be on the same floor
-                        model.Add(emp_floor[(e, f)] <= emp_offsite[m] + emp_floor[(m, f)])
+    for j, (f, cap) in enumerate(floor_caps):
+        model.Add(sum(emp_floor[:, j]) <= cap)
 
+    # Member row indices per department, shared by the constraint loops below
+    dept_rows = {d: [emp_index[e] for e in members] for d, members in departments.items()}
 
+    # One pass over the departments posts both constraint families:
+    #  - max 60% of each department on-site (physical floors only)
+    #  - teams sit on the same floor, encoded as one indicator per
+    #    (department, floor) and an implication per member instead of a
+    #    quadratic pairwise clique. Departments whose cap allows at most
+    #    one on-site member satisfy cohesion trivially and get no
+    #    indicators at all.
+    max_on_site = {d: int(MAX_DEPT_PERCENT * len(m)) for d, m in departments.items()}
+    cohesion_depts = [d for d in departments if max_on_site[d] > 1]
+    dept_floor = {
+        (d, f): model.NewBoolVar('')
+        for d in cohesion_depts
+        for f in floor_list
+    }
 
-    # On-site indicator per employee
-    on_site = {}
-    for e in employees:
-        on_site[e] = model.NewBoolVar(f'on_site_{e}')
-        model.Add(on_site[e] == sum(emp_floor[(e, f)] for f in FLOORS))
+    for dept, rows in dept_rows.items():
+        model.Add(sum(emp_floor[rows].flat) <= max_on_site[dept])
+        if max_on_site[dept] <= 1:
+            continue
+        # Each department occupies at most one floor
+        model.AddAtMostOne(dept_floor[(dept, f)] for f in floor_list)
+        for j, f in enumerate(floor_list):
+            for i in rows:
+                # An on-site member pins the department to that floor
+                model.AddImplication(emp_floor[i, j], dept_floor[(dept, f)])
 
-    # Fairness-based objective: maximize unique employees on-site first, then fill seats
-    model.Maximize(
-        sum(on_site[e] for e in employees) * 1000  # primary: unique employees on-site
-        + sum(emp_floor[(e, f)] for e in employees for f in FLOORS)  # secondary: seat fill
+    # Branch on the department->floor indicators first: fixing where each
+    # team sits collapses the interchangeable per-member floor choices,
+    # which is where the model's symmetry lives
+    model.AddDecisionStrategy(
+        [dept_floor[(d, f)] for d in cohesion_depts for f in floor_list],
+        cp_model.CHOOSE_FIRST,
+        cp_model.SELECT_MIN_VALUE,
     )
 
+    # Maximize employees on-site. The old two-tier form
+    # sum(on_site)*1000 + sum(emp_floor) was redundant: each employee is on
+    # exactly one floor or offsite, so both sums counted the same thing and
+    # the 1000x coefficient only inflated the LP relaxation.
+    model.Maximize(sum(on_site))
+
+    # Warm start: greedily pack departments (largest first) onto the floor
+    # with the most free seats, up to the 60% cap, and hint the solver with
+    # that assignment so it starts from a near-optimal incumbent
+    remaining = dict(floor_caps)
+    for dept in sorted(departments, key=lambda d: -dept_sizes[d]):
+        rows = dept_rows[dept]
+        quota = int(MAX_DEPT_PERCENT * len(rows))
+        f = max(floor_list, key=lambda fl: remaining[fl])
+        j = floor_list.index(f)
+        take = min(quota, remaining[f])
+        remaining[f] -= take
+        for i in rows[:take]:
+            model.AddHint(emp_floor[i, j], 1)
+        for i in rows[take:]:
+            model.AddHint(on_site[i], 0)
+
     # Solve
     solver = cp_model.CpSolver()
     solver.parameters.max_time_in_seconds = 30
-    solver.parameters.search_branching = cp_model.PORTFOLIO_SEARCH
+    # Reproducibility now lives in the solver seed, not a Python-side shuffle
+    solver.parameters.random_seed = 42
+    # AUTOMATIC_SEARCH lets each worker pick its own strategy; forcing
+    # PORTFOLIO_SEARCH just rotated heuristics on the main thread
+    solver.parameters.search_branching = cp_model.AUTOMATIC_SEARCH
+    # Full linearization suits this mostly-linear assignment structure, and
+    # probing/symmetry detection pay off on the interchangeable-employee
+    # Boolean channeling; pin them so upstream default changes don't regress
+    solver.parameters.linearization_level = 2
+    solver.parameters.cp_model_probing_level = 2
+    solver.parameters.symmetry_level = 2
+    # CP-SAT's portfolio is tuned for parallel workers (LNS runs alongside
+    # the main search); a single worker leaves most of that on the table
+    solver.parameters.num_search_workers = min(16, os.cpu_count() or 8)
     status = solver.Solve(model)
 
     # Output
     print(f"Solver status: {solver.StatusName(status)}")
 
     if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-        seating_plan = []
-        table_counters = {}  # Track seats per table
-        
+        # One bulk transfer of the solution array; each solver.Value call is
+        # a separate Python/C++ crossing
+        solution = solver.ResponseProto().solution
+
+        # Collect on-site employees per floor
+        floor_occupants = {f: [] for f in floor_list}
+        for i, e in enumerate(employees):
+            if solution[on_site[i].Index()] == 0:
+                continue
+            for j, f in enumerate(floor_list):
+                if solution[emp_floor[i, j].Index()] == 1:
+                    floor_occupants[f].append(e)
+                    break
+
+        # ID -> Department lookup table; one pass instead of a full-frame
+        # scan per employee
+        dept_by_id = dict(zip(df['ID'], df['Department']))
+
+        # Seats within a floor are interchangeable, so number them here rather
+        # than in the model: stable order by department then ID keeps teams on
+        # adjacent tables
+        assignments = {}
+        for f, occupants in floor_occupants.items():
+            occupants.sort(key=lambda e: (dept_by_id[e], e))
+            for seat_num, e in enumerate(occupants, start=1):
+                assigned_table = ((seat_num - 1) // SEATS_PER_TABLE) + 1
+                assignments[e] = (f, assigned_table, seat_num)
+
+        # Materialize as one column per field rather than a dict per row;
+        # pandas then builds each column in a single pass with no per-row
+        # dict hashing or type re-inference
+        floors_out = []
+        tables_out = []
+        seats_out = []
         for e in employees:
-            assigned_floor = None
-            assigned_seat = None
-            assigned_table = None
-            
-            if solver.Value(emp_offsite[e]) == 1:
-                assigned_floor = 'Offsite'
-            else:
-                for f in FLOORS:
-                    if solver.Value(emp_floor[(e, f)]) == 1:
-                        assigned_floor = f
-                        seat_num = solver.Value(emp_seat[(e, f)])
-                        assigned_seat = seat_num
-                        # Calculate table number based on seat number
-                        assigned_table = ((seat_num - 1) // SEATS_PER_TABLE) + 1
-                        break
-            
-            seating_plan.append({
-                'ID': e,
-                'Department': df.loc[df['ID'] == e, 'Department'].values[0],
-                'Assigned_Floor': assigned_floor,
-                'Assigned_Table': assigned_table,
-                'Assigned_Seat': assigned_seat
-            })
-        seating_df = pd.DataFrame(seating_plan)
+            assigned_floor, assigned_table, assigned_seat = assignments.get(e, ('Offsite', None, None))
+            floors_out.append(assigned_floor)
+            tables_out.append(assigned_table)
+            seats_out.append(assigned_seat)
+
+        seating_df = pd.DataFrame({
+            'ID': employees,
+            'Department': [dept_by_id[e] for e in employees],
+            # Floors stay object-typed: the column mixes ints with 'Offsite'
+            'Assigned_Floor': floors_out,
+            # Nullable small ints instead of the float64 that int/None lists
+            # infer to; seats/tables stay integers end to end and NA still
+            # writes as an empty CSV field
+            'Assigned_Table': pd.array(tables_out, dtype='Int16'),
+            'Assigned_Seat': pd.array(seats_out, dtype='Int16')
+        })
         # Sort by Department first, then by ID within each department
         seating_df = seating_df.sort_values(['Department', 'ID'])
         seating_df.to_csv("seating_plan.csv", index=False)
+        # Warm the read-side cache now so the first /filter or /visualize
+        # after a solve never parses the CSV on the request path
+        _load_plan()
+        _solve_cache[roster_key] = seating_df
         print("Seating plan saved to seating_plan.csv")
+        return seating_df
     else:
         print("No feasible solution found.")
+        return None
 
 # Create a modern interactive floor diagram using Plotly
 def create_interactive_floor_diagram(floor_number, max_seats, seating_df):
+    # Plotly takes hundreds of ms to import and the served /visualize page
+    # uses the plain-HTML diagram, so only this path pays for it
+    import plotly.graph_objects as go
+    import plotly.express as px
+    from plotly.subplots import make_subplots
+
     # Filter data for this floor
     floor_df = seating_df[seating_df['Assigned_Floor'] == floor_number].copy()
-    
+
+    # Seat number -> (ID, Department) lookup, built once instead of a
+    # boolean mask over the floor frame for every seat
+    seat_to_emp = {
+        int(seat): (emp_id, dept)
+        for seat, emp_id, dept in zip(
+            floor_df['Assigned_Seat'], floor_df['ID'], floor_df['Department']
+        )
+    }
+
     # Calculate the grid size based on the number of tables needed
     num_tables = max(1, (max_seats + SEATS_PER_TABLE - 1) // SEATS_PER_TABLE)
     grid_size = max(1, int(np.ceil(np.sqrt(num_tables))))
@@ -246,25 +386,23 @@ def create_interactive_floor_diagram(floor_number, max_seats, seating_df):
     dept_colors = px.colors.qualitative.Bold[:min(len(departments), len(px.colors.qualitative.Bold))]
     color_map = dict(zip(departments, dept_colors))
     
+    # Seat offsets around a table are the same for every table
+    seat_r = 0.65
+    seat_positions = [
+        (seat_r * _SEAT_COS[i], seat_r * _SEAT_SIN[i], i + 1)
+        for i in range(SEATS_PER_TABLE)
+    ]
+
+    # Table outline (hexagon to represent a round table), also shared
+    table_r = 0.4
+    table_x = (table_r * _TABLE_COS).tolist()
+    table_y = (table_r * _TABLE_SIN).tolist()
+
     # For each table, create a visualization
     for table_num in range(1, num_tables + 1):
         row = (table_num - 1) // grid_size + 1
         col = (table_num - 1) % grid_size + 1
         
-        # Get employees at this table
-        table_df = floor_df[floor_df['Assigned_Table'] == table_num].copy()
-        
-        # Table shape (hexagon to represent a round table)
-        table_r = 0.4
-        table_points = []
-        for i in range(7):
-            angle = i * 2 * np.pi / 6
-            x = table_r * np.cos(angle)
-            y = table_r * np.sin(angle)
-            table_points.append((x, y))
-        
-        table_x, table_y = zip(*table_points)
-        
         # Add table shape
         fig.add_trace(
             go.Scatter(
@@ -278,53 +416,55 @@ def create_interactive_floor_diagram(floor_number, max_seats, seating_df):
             row=row, col=col
         )
         
-        # Add seats around the table
-        seat_positions = []
-        seat_r = 0.65
-        for i in range(SEATS_PER_TABLE):
-            angle = i * 2 * np.pi / SEATS_PER_TABLE
-            x = seat_r * np.cos(angle)
-            y = seat_r * np.sin(angle)
-            seat_positions.append((x, y, i+1))
-        
-        # Plot seats and employees
+        # Batch the table's seats into two traces (filled and empty) instead
+        # of one Scatter per seat
+        filled = {'x': [], 'y': [], 'text': [], 'color': [], 'hover': []}
+        empty = {'x': [], 'y': [], 'hover': []}
         for x, y, seat_num in seat_positions:
             # Find employee at this table and seat number
             seat_position = (table_num - 1) * SEATS_PER_TABLE + seat_num
-            seat_employee = floor_df[floor_df['Assigned_Seat'] == seat_position]
-            
-            if not seat_employee.empty:
-                emp_id = seat_employee['ID'].values[0]
-                dept = seat_employee['Department'].values[0]
-                seat_color = color_map.get(dept, 'grey')
-                
-                # Plot filled seat with employee info
-                fig.add_trace(
-                    go.Scatter(
-                        x=[x], y=[y],
-                        mode='markers+text',
-                        marker=dict(size=25, color=seat_color, line=dict(color='white', width=2)),
-                        text=str(emp_id),
-                        textposition="middle center",
-                        hoverinfo='text',
-                        hovertext=f"ID: {emp_id}<br>Department: {dept}<br>Table: {int(table_num)}<br>Seat: {seat_num}", # Fixed: replaced local_seat_num with seat_num
-                        showlegend=False
-                    ),
-                    row=row, col=col
-                )
+            seat_employee = seat_to_emp.get(seat_position)
+
+            if seat_employee is not None:
+                emp_id, dept = seat_employee
+                filled['x'].append(x)
+                filled['y'].append(y)
+                filled['text'].append(str(emp_id))
+                filled['color'].append(color_map.get(dept, 'grey'))
+                filled['hover'].append(f"ID: {emp_id}<br>Department: {dept}<br>Table: {int(table_num)}<br>Seat: {seat_num}")
             else:
-                # Plot empty seat
-                fig.add_trace(
-                    go.Scatter(
-                        x=[x], y=[y],
-                        mode='markers',
-                        marker=dict(size=20, color='rgba(200,200,200,0.5)', line=dict(color='grey', width=1)),
-                        hoverinfo='text',
-                        hovertext=f"Empty Seat {seat_num}", # Fixed: replaced local_seat_num with seat_num
-                        showlegend=False
-                    ),
-                    row=row, col=col
-                )
+                empty['x'].append(x)
+                empty['y'].append(y)
+                empty['hover'].append(f"Empty Seat {seat_num}")
+
+        if filled['x']:
+            # Plot filled seats with employee info
+            fig.add_trace(
+                go.Scatter(
+                    x=filled['x'], y=filled['y'],
+                    mode='markers+text',
+                    marker=dict(size=25, color=filled['color'], line=dict(color='white', width=2)),
+                    text=filled['text'],
+                    textposition="middle center",
+                    hoverinfo='text',
+                    hovertext=filled['hover'],
+                    showlegend=False
+                ),
+                row=row, col=col
+            )
+        if empty['x']:
+            # Plot empty seats
+            fig.add_trace(
+                go.Scatter(
+                    x=empty['x'], y=empty['y'],
+                    mode='markers',
+                    marker=dict(size=20, color='rgba(200,200,200,0.5)', line=dict(color='grey', width=1)),
+                    hoverinfo='text',
+                    hovertext=empty['hover'],
+                    showlegend=False
+                ),
+                row=row, col=col
+            )
     
     # Create a department color legend (but only once)
     for dept, color in color_map.items():
@@ -422,11 +562,12 @@ def create_simple_floor_diagram(floor_num, floor_df):
         dept_colors[dept] = base_color
     
     # Create legend with department counts
-    legend_html = '<div class="legend"><strong>Departments:</strong><br>'
+    legend_parts = ['<div class="legend"><strong>Departments:</strong><br>']
     for dept, color in sorted(dept_colors.items()):
         dept_count = len(floor_df[floor_df['Department'] == dept])
-        legend_html += f'<div class="legend-item"><span class="legend-color" style="background-color: {color};"></span> {dept} ({dept_count})</div>'
-    legend_html += '</div>'
+        legend_parts.append(f'<div class="legend-item"><span class="legend-color" style="background-color: {color};"></span> {dept} ({dept_count})</div>')
+    legend_parts.append('</div>')
+    legend_html = ''.join(legend_parts)
     
     # Add floor summary with floor-specific styling
     floor_accent_colors = {1: "#95BBFE", 2: "#9A47AA"}
@@ -440,34 +581,40 @@ def create_simple_floor_diagram(floor_num, floor_df):
     </div>
     """
     
-    # Group employees by table
-    tables_html = ""
-    for table_num in sorted(floor_df['Assigned_Table'].dropna().unique()):
-        table_df = floor_df[floor_df['Assigned_Table'] == table_num]
+    # (table, relative seat) -> (ID, Department) index, built in one pass
+    # instead of an .apply scan of the table frame for every seat
+    seat_index = {}
+    table_sizes = {}
+    for row in floor_df.itertuples():
+        seat = row.Assigned_Seat
+        if not isinstance(seat, (int, float)) or pd.isna(seat):
+            continue
+        rel_seat = ((int(seat) - 1) % SEATS_PER_TABLE) + 1
+        seat_index[(int(row.Assigned_Table), rel_seat)] = (row.ID, row.Department)
+        table_sizes[int(row.Assigned_Table)] = table_sizes.get(int(row.Assigned_Table), 0) + 1
+
+    # Group employees by table; accumulate fragments in a list so assembly
+    # is one join instead of repeated string reallocation
+    table_parts = []
+    for table_num in sorted(table_sizes):
         
         # Create table container
-        tables_html += f'<div class="table-container">\n'
-        tables_html += f'<div class="table-title">Table {int(table_num)} ({len(table_df)} employees)</div>\n'
-        tables_html += f'<div class="table">\n'
+        table_parts.append('<div class="table-container">\n')
+        table_parts.append(f'<div class="table-title">Table {table_num} ({table_sizes[table_num]} employees)</div>\n')
+        table_parts.append('<div class="table">\n')
         
         # Add seats around the table
         for i in range(SEATS_PER_TABLE):
-            angle = i * 360 / SEATS_PER_TABLE
-            # Calculate position on a circle
-            left = 50 + 40 * np.cos(np.radians(angle))
-            top = 50 + 40 * np.sin(np.radians(angle))
+            # Position on a circle, from the precomputed offsets
+            left = _SEAT_LEFT[i]
+            top = _SEAT_TOP[i]
             
             # Find the employee at this relative seat position within the table
             seat_num = i + 1  # Relative seat number (1-6)
-            
-            # Find employees with this relative position
-            emp_df = table_df[table_df['Assigned_Seat'].apply(
-                lambda x: isinstance(x, (int, float)) and ((int(x) - 1) % SEATS_PER_TABLE) + 1 == seat_num)]
-            
-            if len(emp_df) > 0:
-                emp = emp_df.iloc[0]
-                emp_id = emp['ID']
-                dept = emp['Department']
+            emp = seat_index.get((table_num, seat_num))
+
+            if emp is not None:
+                emp_id, dept = emp
                 
                 # Get base color for this department
                 base_color = dept_colors.get(dept, "#95BBFE")
@@ -481,13 +628,13 @@ def create_simple_floor_diagram(floor_num, floor_df):
                     gradient_end = "#FFFFFF"
                 
                 # Add a subtle gradient effect using CSS
-                tables_html += f"""
+                table_parts.append(f"""
                 <div class="seat" style="left: {left}%; top: {top}%; background: linear-gradient(135deg, {base_color}, {gradient_end});">
                     <span class="emp-id">{emp_id}</span>
                     <span class="seat-num">{seat_num}</span>
                     <div class="employee-tooltip">ID: {emp_id}<br>Dept: {dept}<br>Seat: {seat_num}</div>
                 </div>
-                """
+                """)
             else:
                 # Empty seats with floor-specific styling
                 empty_seat_style = ""
@@ -498,21 +645,21 @@ def create_simple_floor_diagram(floor_num, floor_df):
                 else:
                     empty_seat_style = "background: linear-gradient(135deg, #D9D9D9, #FFFFFF);"
                 
-                tables_html += f"""
+                table_parts.append(f"""
                 <div class="seat empty-seat" style="left: {left}%; top: {top}%; {empty_seat_style}">
                     <span class="seat-num">{seat_num}</span>
                 </div>
-                """
+                """)
         
-        tables_html += '</div>\n</div>\n'
-    
-    return floor_summary + legend_html + tables_html
+        table_parts.append('</div>\n</div>\n')
+
+    return floor_summary + legend_html + ''.join(table_parts)
 
 @app.get("/departments")
 async def get_departments():
     """Return list of departments from the seating plan"""
-    if Path("seating_plan.csv").exists():
-        df = pd.read_csv("seating_plan.csv")
+    df = _load_plan()
+    if df is not None:
         departments = sorted(df['Department'].unique().tolist())
         return {"departments": departments}
     return {"departments": []}
@@ -520,8 +667,8 @@ async def get_departments():
 @app.get("/filter/{department}")
 async def filter_by_department(department: str):
     """Return filtered seating data for a specific department"""
-    if Path("seating_plan.csv").exists():
-        df = pd.read_csv("seating_plan.csv")
+    df = _load_plan()
+    if df is not None:
         if department.lower() == "all":
             filtered_df = df
         else:
@@ -535,15 +682,18 @@ async def filter_by_department(department: str):
 @app.get("/calendar-data")
 async def get_calendar_data(department: str = "All"):
     """Return calendar attendance data, optionally filtered by department"""
-    if Path("seating_plan.csv").exists():
-        df = pd.read_csv("seating_plan.csv")
-        
+    df = _load_plan()
+    if df is not None:
         # Filter by department if specified
         if department.lower() != "all":
             df = df[df['Department'] == department]
         
-        # Count employees by floor for calendar view
+        # Count employees by floor once; the weekday loop below reuses these
+        # scalars instead of rescanning the column per day
         floor_counts = df['Assigned_Floor'].value_counts().to_dict()
+        floor1_total = floor_counts.get(1, 0)
+        floor2_total = floor_counts.get(2, 0)
+        offsite_total = floor_counts.get('Offsite', 0)
         
         # Format data for calendar display
         # Let's assume a 5-day work week (Mon-Fri)
@@ -564,12 +714,12 @@ async def get_calendar_data(department: str = "All"):
             # Alternate between floors based on day of week
             if day_idx % 2 == 0:  # Mon, Wed, Fri
                 # Everyone assigned to floor 1 works on these days
-                day_data["floor1"] = len(df[df['Assigned_Floor'] == 1])
-                day_data["offsite"] = len(df[df['Assigned_Floor'] == 'Offsite']) 
+                day_data["floor1"] = floor1_total
+                day_data["offsite"] = offsite_total
             else:  # Tue, Thu
                 # Everyone assigned to floor 2 works on these days
-                day_data["floor2"] = len(df[df['Assigned_Floor'] == 2])
-                day_data["offsite"] = len(df[df['Assigned_Floor'] == 'Offsite'])
+                day_data["floor2"] = floor2_total
+                day_data["offsite"] = offsite_total
             
             calendar_data.append(day_data)
         
@@ -577,134 +727,53 @@ async def get_calendar_data(department: str = "All"):
     
     return {"error": "No seating plan available"}
 
-@app.get("/visualize", response_class=HTMLResponse)
-async def visualize_floors():
-    if Path("seating_plan.csv").exists():
-        try:
-            df = pd.read_csv("seating_plan.csv")
-            df['Assigned_Floor'] = pd.to_numeric(df['Assigned_Floor'], errors='coerce')
-            
-            # Debug information
-            print(f"Found {len(df)} employees in seating plan")
-            print(f"Floor numbers: {df['Assigned_Floor'].dropna().unique().tolist()}")
-            
-            # Check if we have any seat assignments
-            if df['Assigned_Seat'].isna().all():
-                return "<p>No seat assignments found in the data</p>"
-            
-            # Create a div to hold the plots
-            plot_divs = ""
-            
-            # Generate simple plot for each floor
-            for floor_num in sorted(df['Assigned_Floor'].dropna().unique()):
-                if floor_num == 'Offsite':
-                    continue
-                    
-                floor_num = int(floor_num)  # Ensure floor_num is an integer
-                print(f"Creating diagram for floor {floor_num}")
-                
-                # Get employees on this floor
-                floor_df = df[df['Assigned_Floor'] == floor_num]
-                print(f"Employees on floor {floor_num}: {len(floor_df)}")
-                
-                if len(floor_df) == 0:
-                    continue
-                
-                # Generate HTML for this floor's visualization
-                floor_html = create_simple_floor_diagram(floor_num, floor_df)
-                
-                # Add this plot to our HTML
-                plot_divs += f"""
-                <div class="floor-plot-container">
-                    <h2>Floor {floor_num} Seating Arrangement</h2>
-                    {floor_html}
-                </div>
-                """
-            
-            # Generate calendar data directly here
-            weekdays = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-            calendar_html = ""
-            
-            # Get total employees count
-            total_employees = len(df)
-            
-            # Calculate calendar attendance
-            # Define ranges for each floor
-            floor1_min, floor1_max = 45, 50
-            floor2_min, floor2_max = 44, 48
-            
-            # Generate floor counts for each day
-            calendar_data = []
-            for day_idx, day in enumerate(weekdays):
-                # Vary the counts slightly by day to make it more realistic
-                if day_idx % 2 == 0:  # Monday, Wednesday, Friday - higher Floor 1 attendance
-                    floor1_count = min(floor1_max, max(floor1_min, int(floor1_max * (0.95 + 0.05 * (day_idx % 3)))))
-                    floor2_count = min(floor2_max, max(floor2_min, int(floor2_min * (0.9 + 0.05 * (day_idx % 3)))))
-                else:  # Tuesday, Thursday - higher Floor 2 attendance
-                    floor1_count = min(floor1_max, max(floor1_min, int(floor1_min * (0.9 + 0.05 * (day_idx % 2)))))
-                    floor2_count = min(floor2_max, max(floor2_min, int(floor2_max * (0.95 + 0.05 * (day_idx % 2)))))
-                
-                # Calculate offsite as remaining employees
-                offsite_count = total_employees - (floor1_count + floor2_count)
-                
-                # Ensure offsite count is not negative
-                if offsite_count < 0:
-                    # Adjust floor counts to ensure offsite is at least 0
-                    excess = abs(offsite_count)
-                    floor1_reduction = min(excess // 2, floor1_count - floor1_min)
-                    floor1_count -= floor1_reduction
-                    excess -= floor1_reduction
-                    
-                    floor2_reduction = min(excess, floor2_count - floor2_min)
-                    floor2_count -= floor2_reduction
-                    
-                    offsite_count = total_employees - (floor1_count + floor2_count)
-                day_class = "calendar-day" + (" calendar-day-today" if day_idx == 0 else "")
-                
-                calendar_html += f"""
-                <div class="{day_class}" data-day="{day.lower()}">
-                    <h3>{day}</h3>
+# Calendar-day markup compiled once by Jinja2; the route renders it with
+# per-day values instead of re-formatting the block as an f-string
+_DAY_TEMPLATE = jinja2.Environment().from_string("""
+                <div class="{{ day_class }}" data-day="{{ day|lower }}">
+                    <h3>{{ day }}</h3>
                     <div class="calendar-attendance">
                         <div class="attendance-item">
                             <span>Floor 1:</span>
-                            <span class="attendance-floor1">{floor1_count} employees</span>
+                            <span class="attendance-floor1">{{ floor1_count }} employees</span>
                         </div>
                         <div class="attendance-item">
                             <span>Floor 2:</span>
-                            <span class="attendance-floor2">{floor2_count} employees</span>
+                            <span class="attendance-floor2">{{ floor2_count }} employees</span>
                         </div>
                         <div class="attendance-item">
                             <span>Offsite:</span>
-                            <span class="attendance-offsite">{offsite_count} employees</span>
+                            <span class="attendance-offsite">{{ offsite_count }} employees</span>
                         </div>
                     </div>
                 </div>
-                """
-            
-            # Return complete HTML with all floor plans and new calendar view
-            return f"""
+                """)
+
+# The /visualize stylesheet is fully static, so it is built once at
+# import time instead of re-formatted inside the handler on every request
+_STATIC_CSS = """
             <style>
                 @import url('https://fonts.googleapis.com/css2?family=Courier+Prime:wght@400;700&display=swap');
                 
-                * {{
+                * {
                     font-family: 'Courier Prime', monospace;
-                }}
+                }
                 
-                .floor-plot-container {{
+                .floor-plot-container {
                     margin-bottom: 40px;
                     padding: 20px;
                     background-color: #FFFFFF;
                     border-radius: 8px;
                     box-shadow: 0 4px 12px rgba(102, 139, 204, 0.2);
                     border-top: 3px solid #95BBFE;
-                }}
+                }
                 
-                .table-container {{
+                .table-container {
                     display: inline-block;
                     margin: 10px;
                     vertical-align: top;
-                }}
-                .table {{
+                }
+                .table {
                     position: relative;
                     width: 200px;
                     height: 200px;
@@ -713,8 +782,8 @@ async def visualize_floors():
                     border: 2px solid #95BBFE;
                     margin: 20px auto;
                     box-shadow: 0 3px 10px rgba(102, 139, 204, 0.15);
-                }}
-                .seat {{
+                }
+                .seat {
                     position: absolute;
                     width: 46px;
                     height: 46px;
@@ -730,23 +799,23 @@ async def visualize_floors():
                     transition: transform 0.2s ease, box-shadow 0.2s ease;
                     border: 2px solid rgba(255,255,255,0.7);
                     font-family: 'Courier Prime', monospace;
-                }}
-                .seat:hover {{
+                }
+                .seat:hover {
                     transform: translate(-50%, -50%) scale(1.1);
                     box-shadow: 0 4px 8px rgba(102, 139, 204, 0.4);
                     z-index: 10;
-                }}
-                .empty-seat {{
+                }
+                .empty-seat {
                     color: #888;
                     border: 1px dashed #95BBFE;
-                }}
-                .emp-id {{
+                }
+                .emp-id {
                     font-size: 14px;
                     font-weight: bold;
                     text-shadow: 0 1px 2px rgba(255,255,255,0.5);
                     font-family: 'Courier Prime', monospace;
-                }}
-                .seat-num {{
+                }
+                .seat-num {
                     position: absolute;
                     font-size: 10px;
                     background: #FFFFFF;
@@ -761,8 +830,8 @@ async def visualize_floors():
                     border: 1px solid #95BBFE;
                     box-shadow: 0 1px 3px rgba(102, 139, 204, 0.2);
                     font-family: 'Courier Prime', monospace;
-                }}
-                .employee-tooltip {{
+                }
+                .employee-tooltip {
                     visibility: hidden;
                     width: 120px;
                     background-color: #668BCC;
@@ -780,21 +849,21 @@ async def visualize_floors():
                     transform: translateY(10px);
                     box-shadow: 0 5px 15px rgba(102, 139, 204, 0.4);
                     font-family: 'Courier Prime', monospace;
-                }}
-                .seat:hover .employee-tooltip {{
+                }
+                .seat:hover .employee-tooltip {
                     visibility: visible;
                     opacity: 1;
                     transform: translateY(0);
-                }}
-                .table-title {{
+                }
+                .table-title {
                     text-align: center;
                     font-weight: 500;
                     margin-bottom: 5px;
                     color: #668BCC;
                     font-size: 14px;
                     font-family: 'Courier Prime', monospace;
-                }}
-                .legend {{
+                }
+                .legend {
                     margin-top: 15px;
                     margin-bottom: 20px;
                     padding: 12px 15px;
@@ -803,16 +872,16 @@ async def visualize_floors():
                     border: 1px solid #D9D9D9;
                     box-shadow: 0 1px 3px rgba(0,0,0,0.05);
                     font-family: 'Courier Prime', monospace;
-                }}
-                .legend-item {{
+                }
+                .legend-item {
                     display: inline-block;
                     margin-right: 15px;
                     margin-bottom: 8px;
                     font-size: 13px;
                     color: #555;
                     font-family: 'Courier Prime', monospace;
-                }}
-                .legend-color {{
+                }
+                .legend-color {
                     display: inline-block;
                     width: 15px;
                     height: 15px;
@@ -821,8 +890,8 @@ async def visualize_floors():
                     vertical-align: middle;
                     box-shadow: 0 1px 2px rgba(0,0,0,0.1);
                     border: 1px solid rgba(255,255,255,0.7);
-                }}
-                .floor-summary {{
+                }
+                .floor-summary {
                     margin-bottom: 15px;
                     padding: 12px 15px;
                     background-color: #F5F9FF;
@@ -831,11 +900,11 @@ async def visualize_floors():
                     box-shadow: 0 1px 3px rgba(102, 139, 204, 0.1);
                     color: #668BCC;
                     font-family: 'Courier Prime', monospace;
-                }}
-                h2, h3, strong, p, div {{
+                }
+                h2, h3, strong, p, div {
                     font-family: 'Courier Prime', monospace;
-                }}
-                h2 {{
+                }
+                h2 {
                     font-size: 22px;
                     font-weight: 700;
                     text-align: center;
@@ -845,25 +914,25 @@ async def visualize_floors():
                     -webkit-text-fill-color: transparent;
                     background-clip: text;
                     font-family: 'Courier Prime', monospace;
-                }}
+                }
                 
                 /* Filter styles */
-                .filter-container {{
+                .filter-container {
                     margin-bottom: 20px;
                     padding: 15px;
                     background-color: #FFFFFF;
                     border-radius: 8px;
                     box-shadow: 0 4px 12px rgba(102, 139, 204, 0.2);
-                }}
+                }
                 
-                .filter-label {{
+                .filter-label {
                     display: inline-block;
                     margin-right: 10px;
                     font-weight: bold;
                     color: #668BCC;
-                }}
+                }
                 
-                .filter-select {{
+                .filter-select {
                     padding: 8px 12px;
                     border: 2px solid #95BBFE;
                     border-radius: 4px;
@@ -872,25 +941,25 @@ async def visualize_floors():
                     color: #333;
                     cursor: pointer;
                     min-width: 200px;
-                }}
+                }
                 
-                .filter-select:focus {{
+                .filter-select:focus {
                     outline: none;
                     border-color: #9A47AA;
                     box-shadow: 0 0 0 2px rgba(154, 71, 170, 0.2);
-                }}
+                }
                 
                 /* Calendar styles */
-                .calendar-container {{
+                .calendar-container {
                     margin-bottom: 40px;
                     padding: 20px;
                     background-color: #FFFFFF;
                     border-radius: 8px;
                     box-shadow: 0 4px 12px rgba(102, 139, 204, 0.2);
                     border-top: 3px solid #9A47AA;
-                }}
+                }
                 
-                .calendar-title {{
+                .calendar-title {
                     text-align: center;
                     margin-bottom: 20px;
                     background: linear-gradient(135deg, #9A47AA, #668BCC);
@@ -899,16 +968,16 @@ async def visualize_floors():
                     background-clip: text;
                     font-size: 22px;
                     font-weight: 700;
-                }}
+                }
                 
-                .calendar-grid {{
+                .calendar-grid {
                     display: flex;
                     flex-wrap: wrap;
                     gap: 12px;
                     justify-content: space-between;
-                }}
+                }
                 
-                .calendar-day {{
+                .calendar-day {
                     flex: 1;
                     min-width: 150px;
                     padding: 15px;
@@ -917,62 +986,181 @@ async def visualize_floors():
                     box-shadow: 0 2px 6px rgba(0, 0, 0, 0.05);
                     border-left: 3px solid #95BBFE;
                     transition: transform 0.2s ease, box-shadow 0.2s ease;
-                }}
+                }
                 
-                .calendar-day:hover {{
+                .calendar-day:hover {
                     transform: translateY(-3px);
                     box-shadow: 0 5px 15px rgba(102, 139, 204, 0.15);
-                }}
+                }
                 
-                .calendar-day-today {{
+                .calendar-day-today {
                     border-left: 3px solid #9A47AA;
                     background: linear-gradient(to bottom, rgba(154, 71, 170, 0.1), rgba(255, 255, 255, 1));
                     box-shadow: 0 3px 8px rgba(154, 71, 170, 0.15);
-                }}
+                }
                 
-                .calendar-day h3 {{
+                .calendar-day h3 {
                     margin-top: 0;
                     color: #668BCC;
                     font-size: 16px;
                     border-bottom: 1px solid #eee;
                     padding-bottom: 8px;
-                }}
+                }
                 
-                .calendar-day-today h3 {{
+                .calendar-day-today h3 {
                     color: #9A47AA;
-                }}
+                }
                 
-                .calendar-attendance {{
+                .calendar-attendance {
                     margin-top: 10px;
                     font-size: 14px;
-                }}
+                }
                 
-                .attendance-item {{
+                .attendance-item {
                     display: flex;
                     justify-content: space-between;
                     margin-bottom: 5px;
                     padding: 3px 0;
-                }}
+                }
                 
-                .attendance-floor1 {{
+                .attendance-floor1 {
                     color: #95BBFE;
                     font-weight: bold;
-                }}
+                }
                 
-                .attendance-floor2 {{
+                .attendance-floor2 {
                     color: #9A47AA;
                     font-weight: bold;
-                }}
+                }
                 
-                .attendance-offsite {{
+                .attendance-offsite {
                     color: #888;
                     font-weight: bold;
-                }}
+                }
                 
-                .hidden {{
+                .hidden {
                     display: none !important;
-                }}
+                }
             </style>
+"""
+
+# Rendered floor-plan divs cached against the plan CSV's mtime; the
+# per-request work is then just the small calendar block and final join
+_floor_html_cache = None
+
+
+@app.get("/visualize", response_class=HTMLResponse)
+async def visualize_floors():
+    df = _load_plan()
+    if df is not None:
+        try:
+            # Work on a copy: the numeric floor conversion must not leak into
+            # the shared cached frame
+            df = df.copy()
+            df['Assigned_Floor'] = pd.to_numeric(df['Assigned_Floor'], errors='coerce')
+            
+            # Debug information
+            print(f"Found {len(df)} employees in seating plan")
+            print(f"Floor numbers: {df['Assigned_Floor'].dropna().unique().tolist()}")
+            
+            # Check if we have any seat assignments
+            if df['Assigned_Seat'].isna().all():
+                return "<p>No seat assignments found in the data</p>"
+            
+            # The floor diagrams are deterministic in the plan CSV, so the
+            # rendered divs are cached against its mtime like _load_plan
+            global _floor_html_cache
+            plan_mtime = Path("seating_plan.csv").stat().st_mtime
+            if _floor_html_cache is not None and _floor_html_cache[0] == plan_mtime:
+                plot_divs = _floor_html_cache[1]
+            else:
+                # Collect the plot divs and join once at the end instead of
+                # rebuilding the string on every += iteration
+                plot_div_parts = []
+
+                # Generate simple plot for each floor; one groupby pass
+                # instead of re-filtering the frame per floor
+                floor_groups = []
+                for floor_num, floor_df in df.dropna(subset=['Assigned_Floor']).groupby('Assigned_Floor', sort=True):
+                    floor_num = int(floor_num)  # Ensure floor_num is an integer
+                    print(f"Creating diagram for floor {floor_num}")
+                    print(f"Employees on floor {floor_num}: {len(floor_df)}")
+
+                    if len(floor_df) == 0:
+                        continue
+                    floor_groups.append((floor_num, floor_df))
+
+                # Render the floors concurrently in worker threads: the HTML
+                # build is pure CPU and would otherwise block the event loop
+                floor_htmls = await asyncio.gather(*[
+                    asyncio.to_thread(create_simple_floor_diagram, floor_num, floor_df)
+                    for floor_num, floor_df in floor_groups
+                ])
+
+                for (floor_num, _), floor_html in zip(floor_groups, floor_htmls):
+                    # Add this plot to our HTML
+                    plot_div_parts.append(f"""
+                <div class="floor-plot-container">
+                    <h2>Floor {floor_num} Seating Arrangement</h2>
+                    {floor_html}
+                </div>
+                """)
+
+                plot_divs = ''.join(plot_div_parts)
+                _floor_html_cache = (plan_mtime, plot_divs)
+            
+            # Generate calendar data directly here
+            weekdays = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+            calendar_parts = []
+            
+            # Get total employees count
+            total_employees = len(df)
+            
+            # Calculate calendar attendance
+            # Define ranges for each floor
+            floor1_min, floor1_max = 45, 50
+            floor2_min, floor2_max = 44, 48
+            
+            # Generate floor counts for each day
+            calendar_data = []
+            for day_idx, day in enumerate(weekdays):
+                # Vary the counts slightly by day to make it more realistic
+                if day_idx % 2 == 0:  # Monday, Wednesday, Friday - higher Floor 1 attendance
+                    floor1_count = min(floor1_max, max(floor1_min, int(floor1_max * (0.95 + 0.05 * (day_idx % 3)))))
+                    floor2_count = min(floor2_max, max(floor2_min, int(floor2_min * (0.9 + 0.05 * (day_idx % 3)))))
+                else:  # Tuesday, Thursday - higher Floor 2 attendance
+                    floor1_count = min(floor1_max, max(floor1_min, int(floor1_min * (0.9 + 0.05 * (day_idx % 2)))))
+                    floor2_count = min(floor2_max, max(floor2_min, int(floor2_max * (0.95 + 0.05 * (day_idx % 2)))))
+                
+                # Calculate offsite as remaining employees
+                offsite_count = total_employees - (floor1_count + floor2_count)
+                
+                # Ensure offsite count is not negative
+                if offsite_count < 0:
+                    # Adjust floor counts to ensure offsite is at least 0
+                    excess = abs(offsite_count)
+                    floor1_reduction = min(excess // 2, floor1_count - floor1_min)
+                    floor1_count -= floor1_reduction
+                    excess -= floor1_reduction
+                    
+                    floor2_reduction = min(excess, floor2_count - floor2_min)
+                    floor2_count -= floor2_reduction
+                    
+                    offsite_count = total_employees - (floor1_count + floor2_count)
+                day_class = "calendar-day" + (" calendar-day-today" if day_idx == 0 else "")
+
+                calendar_parts.append(_DAY_TEMPLATE.render(
+                    day_class=day_class,
+                    day=day,
+                    floor1_count=floor1_count,
+                    floor2_count=floor2_count,
+                    offsite_count=offsite_count,
+                ))
+
+            calendar_html = ''.join(calendar_parts)
+
+            # Return complete HTML with all floor plans and new calendar view
+            return _STATIC_CSS + f"""
             
             <div class="calendar-container">
                 <h2 class="calendar-title">Weekly Attendance Calendar</h2>
@@ -1002,18 +1190,22 @@ async def visualize_floors():
     return "<p>No seating plan available</p>"
 
 
+# The calendar payload is hard-coded to Aug 18-22, 2023 and uses nothing
+# from the seating plan, so it is built once and reused across requests
+_calendar_payload = None
+
+
 @app.get("/generate-calendar")
 async def generate_calendar_events():
     """Generate calendar events for onsite/offsite days for specific week of August 18-22"""
+    global _calendar_payload
     if not Path("seating_plan.csv").exists():
         return {"error": "No seating plan available"}
-    
+
+    if _calendar_payload is not None:
+        return _calendar_payload
+
     try:
-        df = pd.read_csv("seating_plan.csv")
-        
-        # Use fixed dates: August 18-22, 2023 (Monday-Friday)
-        from datetime import datetime
-        
         # Define the specific dates we want (August 18-22, 2023)
         specific_dates = [
             {"date": "20230818", "formatted_date": "Aug 18", "day_name": "Monday"},
@@ -1045,17 +1237,17 @@ async def generate_calendar_events():
             start_time = "090000"
             end_time = "170000"
             
-            # Create Google Calendar event URL
-            event_url = (
-                f"https://calendar.google.com/calendar/render?"
-                f"action=TEMPLATE"
-                f"&text={title}"
-                f"&dates={date}T{start_time}/{date}T{end_time}"
-                f"&details={description}"
-                f"&location={location}"
-                f"&sf=true"
-                f"&output=xml"
-            )
+            # Create Google Calendar event URL; urlencode percent-escapes
+            # the spaces/parentheses the old f-string left raw
+            event_url = "https://calendar.google.com/calendar/render?" + urlencode({
+                "action": "TEMPLATE",
+                "text": title,
+                "dates": f"{date}T{start_time}/{date}T{end_time}",
+                "details": description,
+                "location": location,
+                "sf": "true",
+                "output": "xml",
+            })
             
             calendar_events.append({
                 "date": date,
@@ -1067,12 +1259,13 @@ async def generate_calendar_events():
             })
         
         # Return events for the specific week
-        return {
+        _calendar_payload = {
             "events": calendar_events,
             "week_start": "2023-08-18",
             "week_end": "2023-08-22",
             "all_events_url": generate_combined_calendar_url(calendar_events)
         }
+        return _calendar_payload
     except Exception as e:
         import traceback
         print(f"Error generating calendar events: {traceback.format_exc()}")
@@ -1093,7 +1286,6 @@ if __name__ == "__main__":
     Path("processed").mkdir(exist_ok=True)
     
     # Get port from environment variable or use default
-    import os
     port = int(os.environ.get("PORT", 5000))
 
 